@@ -1,3 +1,48 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Account, ActivityLog, AutoTransfer, Message, Notification, Profile, Transaction
+
+
+# The changelist renders str(obj) per row; join whatever __str__ dereferences
+@admin.register(Profile)
+class ProfileAdmin(admin.ModelAdmin):
+    list_select_related = ('user',)
+    # Maintained with F() updates; never written from a form
+    readonly_fields = ('unread_messages_count', 'total_balance_cached')
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            # Write only the edited columns so the counters aren't overwritten
+            obj.save(update_fields=form.changed_data)
+        else:
+            obj.save()
+
+
+@admin.register(Account)
+class AccountAdmin(admin.ModelAdmin):
+    list_select_related = ('user',)
+
+
+@admin.register(Transaction)
+class TransactionAdmin(admin.ModelAdmin):
+    pass
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    pass
+
+
+@admin.register(Message)
+class MessageAdmin(admin.ModelAdmin):
+    list_select_related = ('sender', 'receiver')
+
+
+@admin.register(ActivityLog)
+class ActivityLogAdmin(admin.ModelAdmin):
+    list_select_related = ('user',)
+
+
+@admin.register(AutoTransfer)
+class AutoTransferAdmin(admin.ModelAdmin):
+    pass
@@ -0,0 +1,58 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Profile
+
+STAFF_USER_IDS_KEY = 'staff_user_ids'
+STAFF_USER_IDS_TTL = 300
+STAFF_PROFILE_USER_IDS_KEY = 'staff_profile_user_ids'
+BALANCE_CHART_TTL = 300
+SPENDING_INSIGHTS_TTL = 300
+ADMIN_DASHBOARD_TTL = 45
+
+
+def get_staff_user_ids():
+    """Return the ids of staff users, cached until a User is saved or deleted."""
+    return cache.get_or_set(
+        STAFF_USER_IDS_KEY,
+        lambda: list(User.objects.filter(is_staff=True).values_list('id', flat=True)),
+        STAFF_USER_IDS_TTL,
+    )
+
+
+def invalidate_staff_user_ids():
+    cache.delete(STAFF_USER_IDS_KEY)
+
+
+def get_staff_profile_user_ids():
+    """Return the user ids of staff-role profiles, cached until a Profile is saved or deleted."""
+    return cache.get_or_set(
+        STAFF_PROFILE_USER_IDS_KEY,
+        lambda: list(Profile.objects.filter(role='staff').values_list('user_id', flat=True)),
+        STAFF_USER_IDS_TTL,
+    )
+
+
+def invalidate_staff_profile_user_ids():
+    cache.delete(STAFF_PROFILE_USER_IDS_KEY)
+
+
+def balance_chart_key(profile_id, balance_rows):
+    """Cache key for a customer's balance chart; any balance change yields a new key."""
+    return f'balance_chart:{profile_id}:{hash(tuple(balance_rows))}'
+
+
+def spending_insights_key(user_id, latest_timestamp, count):
+    """Cache key for a customer's spending payload; a new or removed transaction yields a new key."""
+    stamp = latest_timestamp.isoformat() if latest_timestamp else 'none'
+    return f'spending_insights:{user_id}:{stamp}:{count}'
+
+
+def admin_dashboard_key():
+    """Cache key for the admin dashboard figures; "today" totals roll over at midnight."""
+    return f'admin_dashboard:{timezone.localdate().isoformat()}'
+
+
+def invalidate_admin_dashboard():
+    cache.delete(admin_dashboard_key())
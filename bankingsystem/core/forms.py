@@ -1,8 +1,11 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
-from django.contrib.auth.hashers import make_password
-from .models import Account, Profile
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse_lazy
+from .caching import get_staff_user_ids
+from .models import Account, Profile, from_cents, to_cents
 from .models import Message
 
 # Deposit, Withdraw, Transfer forms
@@ -14,6 +17,10 @@ class DepositForm(forms.Form):
         self.user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
 
+    def clean_amount(self):
+        # Balances are stored in cents
+        return to_cents(self.cleaned_data['amount'])
+
 
 class WithdrawForm(forms.Form):
     amount = forms.DecimalField(max_digits=12, decimal_places=2, min_value=0.01, label='Withdraw Amount')
@@ -23,17 +30,41 @@ class WithdrawForm(forms.Form):
         self.user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
 
+    def clean_amount(self):
+        # Balances are stored in cents
+        return to_cents(self.cleaned_data['amount'])
+
 
 class TransferForm(forms.Form):
     amount = forms.DecimalField(max_digits=12, decimal_places=2, min_value=0.01, label='Transfer Amount')
-    target_account = forms.ModelChoiceField(queryset=Account.objects.all(), label='Target Account')
+    # Typed/autocompleted account number instead of a <select> of every account
+    target_account = forms.ModelChoiceField(
+        queryset=Account.objects.none(),
+        label='Target Account',
+        widget=forms.TextInput(attrs={
+            'data-autocomplete-url': reverse_lazy('account_autocomplete'),
+            'autocomplete': 'off',
+        }),
+    )
 
     def __init__(self, *args, **kwargs):
         self.account = kwargs.pop('account', None)
         self.user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
         if self.account:
-            self.fields['target_account'].queryset = Account.objects.exclude(id=self.account.id)
+            self.fields['target_account'].widget.attrs['data-autocomplete-exclude'] = self.account.id
+            # Only approved accounts can receive money; join the owner so the
+            # option labels don't cost one query per row
+            self.fields['target_account'].queryset = (
+                Account.objects.filter(status='approved')
+                .exclude(id=self.account.id)
+                .select_related('user')
+                .only('id', 'account_type', 'owner', 'user__username')
+            )
+
+    def clean_amount(self):
+        # Balances are stored in cents
+        return to_cents(self.cleaned_data['amount'])
 
 
 # User registration
@@ -45,21 +76,7 @@ class RegisterForm(UserCreationForm):
         fields = ("username", "email", "password1", "password2")
 
 
-# Account management
-class AccountForm(forms.ModelForm):
-    class Meta:
-        model = Account
-        fields = ['owner', 'account_type', 'balance']
-        widgets = {
-            'owner': forms.Select(),
-        }
-
-
 # Customer addition
-def make_password(param):
-    pass
-
-
 class AddCustomerForm(forms.Form):
     username = forms.CharField(max_length=150)
     email = forms.EmailField()
@@ -79,42 +96,72 @@ class AddCustomerForm(forms.Form):
     def save(self, user=None):
         data = self.cleaned_data
 
-        if user is None:
-            # CREATE NEW USER using create_user (handles hashing and NOT NULL)
-            user = User.objects.create_user(
-                username=data['username'],
-                email=data['email'],
-                first_name=data['first_name'],
-                last_name=data['last_name'],
-                password=data['password']  # create_user hashes automatically
-            )
-            # Create profile for new customer
-            Profile.objects.get_or_create(user=user, defaults={'role': 'customer'})
-        else:
-            # UPDATE EXISTING USER
-            user.username = data['username']
-            user.email = data['email']
-            user.first_name = data['first_name']
-            user.last_name = data['last_name']
-
-            if data.get('password'):
-                user.set_password(data['password'])
-
-            user.save()
-            # Ensure profile exists
-            Profile.objects.get_or_create(user=user, defaults={'role': 'customer'})
+        with transaction.atomic():
+            if user is None:
+                # CREATE NEW USER using create_user (handles hashing and NOT NULL)
+                user = User.objects.create_user(
+                    username=data['username'],
+                    email=data['email'],
+                    first_name=data['first_name'],
+                    last_name=data['last_name'],
+                    password=data['password']  # create_user hashes automatically
+                )
+                # The customer profile is created by the User post_save signal
+            else:
+                # UPDATE EXISTING USER
+                user.username = data['username']
+                user.email = data['email']
+                user.first_name = data['first_name']
+                user.last_name = data['last_name']
+
+                if data.get('password'):
+                    user.set_password(data['password'])
+
+                # Ensure profile exists; the reverse accessor is usually cached
+                # already, so this only queries for users that lack one
+                if not hasattr(user, 'profile'):
+                    Profile.objects.create(user=user, role='customer')
+                user.save()
 
         return user
+
+
+# Account management
 class AccountForm(forms.ModelForm):
+    # Entered in dollars, stored in cents
+    balance = forms.DecimalField(max_digits=12, decimal_places=2, initial=0,
+                                 widget=forms.NumberInput(attrs={'step': 0.01}))
+    # Validation-only queryset, assigned in __init__
+    owner = forms.ModelChoiceField(
+        queryset=Profile.objects.none(),
+        widget=forms.TextInput(attrs={
+            'data-autocomplete-url': reverse_lazy('customer_autocomplete'),
+            'autocomplete': 'off',
+        }),
+    )
+
     class Meta:
         model = Account
         fields = ['account_type', 'balance', 'owner']
-        widgets = {
-            'balance': forms.NumberInput(attrs={'step': 0.01}),
-        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Customers, plus whoever currently owns the account being edited
+        self.fields['owner'].queryset = Profile.objects.filter(
+            Q(role='customer') | Q(pk=self.instance.owner_id)
+        )
+        if self.instance.pk:
+            self.initial['balance'] = from_cents(self.instance.balance)
+
+    def clean_balance(self):
+        return to_cents(self.cleaned_data['balance'])
 
 
 class CustomerMessageForm(forms.ModelForm):
+    # Declared with an empty queryset so the model's default (every User) is
+    # never the fallback; the staff list is assigned in __init__
+    receiver = forms.ModelChoiceField(queryset=User.objects.none(), label="Send To Admin")
+
     class Meta:
         model = Message
         fields = ['content', 'receiver']  # only content and receiver
@@ -123,7 +170,5 @@ class CustomerMessageForm(forms.ModelForm):
         user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
 
-        if user:
-            # Only allow sending to admin users
-            self.fields['receiver'].queryset = User.objects.filter(is_staff=True)
-            self.fields['receiver'].label = "Send To Admin"
\ No newline at end of file
+        # Only allow sending to admin users; the staff ids are cached
+        self.fields['receiver'].queryset = User.objects.filter(pk__in=get_staff_user_ids()).only('id', 'username')
\ No newline at end of file
@@ -0,0 +1,109 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction as db_transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from core.caching import invalidate_admin_dashboard
+from core.models import Account, AutoTransfer, Profile, Transaction
+
+
+def run_due_auto_transfers(now=None):
+    """Execute every AutoTransfer whose next_run has passed, in a fixed number of queries.
+
+    Balances are checked in order of next_run against a running copy of each
+    source balance; transfers that would overdraw, or that touch an account
+    which is not approved, are skipped and stay due for the next run.
+    Returns ``(executed, skipped)`` counts.
+    """
+    now = now or timezone.now()
+
+    with db_transaction.atomic():
+        due = list(
+            AutoTransfer.objects.select_for_update()
+            .filter(next_run__lte=now)
+            .order_by('next_run', 'id')
+        )
+        if not due:
+            return 0, 0
+
+        account_ids = {at.from_account_id for at in due} | {at.to_account_id for at in due}
+        balances = {}
+        owners = {}
+        for account_id, balance, owner_id in (
+            Account.objects.select_for_update()
+            .filter(id__in=account_ids, status='approved')
+            .values_list('id', 'balance', 'owner_id')
+        ):
+            balances[account_id] = balance
+            owners[account_id] = owner_id
+
+        deltas = defaultdict(int)
+        executed = []
+        for at in due:
+            if at.from_account_id not in balances or at.to_account_id not in balances:
+                continue
+            if at.amount <= 0 or balances[at.from_account_id] < at.amount:
+                continue
+            balances[at.from_account_id] -= at.amount
+            balances[at.to_account_id] += at.amount
+            deltas[at.from_account_id] -= at.amount
+            deltas[at.to_account_id] += at.amount
+            executed.append(at)
+
+        if executed:
+            # One UPDATE for every touched balance
+            Account.objects.filter(id__in=deltas).update(
+                balance=F('balance') + Case(
+                    *[When(id=account_id, then=Value(delta)) for account_id, delta in deltas.items()],
+                    default=Value(0),
+                )
+            )
+
+            # ...and one for the owners' cached totals
+            owner_deltas = defaultdict(int)
+            for account_id, delta in deltas.items():
+                owner_deltas[owners[account_id]] += delta
+            owner_deltas = {owner_id: delta for owner_id, delta in owner_deltas.items() if delta}
+            if owner_deltas:
+                Profile.objects.filter(id__in=owner_deltas).update(
+                    total_balance_cached=F('total_balance_cached') + Case(
+                        *[When(id=owner_id, then=Value(delta)) for owner_id, delta in owner_deltas.items()],
+                        default=Value(0),
+                    )
+                )
+
+            Transaction.objects.bulk_create(
+                [
+                    Transaction(account_id=account_id, transaction_type=tx_type, amount=at.amount)
+                    for at in executed
+                    for account_id, tx_type in (
+                        (at.from_account_id, 'transfer_out'),
+                        (at.to_account_id, 'transfer_in'),
+                    )
+                ]
+            )
+
+            # One UPDATE per distinct frequency to move next_run forward
+            by_frequency = defaultdict(list)
+            for at in executed:
+                by_frequency[at.frequency_days].append(at.id)
+            for frequency_days, ids in by_frequency.items():
+                AutoTransfer.objects.filter(id__in=ids).update(
+                    next_run=F('next_run') + timedelta(days=frequency_days)
+                )
+
+            # bulk_create and update() send no signals
+            invalidate_admin_dashboard()
+
+    return len(executed), len(due) - len(executed)
+
+
+class Command(BaseCommand):
+    help = "Execute auto transfers that are due. Intended to be run periodically (e.g. from cron)."
+
+    def handle(self, *args, **options):
+        executed, skipped = run_due_auto_transfers()
+        self.stdout.write(f"Executed {executed} auto transfer(s), skipped {skipped}.")
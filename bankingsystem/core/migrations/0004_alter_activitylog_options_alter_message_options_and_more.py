@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_alter_account_status_alter_activitylog_timestamp_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='activitylog',
+            options={'ordering': ['-timestamp']},
+        ),
+        migrations.AlterModelOptions(
+            name='message',
+            options={'ordering': ['-timestamp']},
+        ),
+        migrations.AlterModelOptions(
+            name='notification',
+            options={'ordering': ['-timestamp']},
+        ),
+        migrations.AlterModelOptions(
+            name='transaction',
+            options={'ordering': ['-timestamp']},
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:07
+
+from django.conf import settings
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_owner_user(apps, schema_editor):
+    Account = apps.get_model('core', 'Account')
+    Profile = apps.get_model('core', 'Profile')
+    Account.objects.update(
+        user=Subquery(Profile.objects.filter(pk=OuterRef('owner_id')).values('user_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0004_alter_activitylog_options_alter_message_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='user',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='owned_accounts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(copy_owner_user, migrations.RunPython.noop),
+    ]
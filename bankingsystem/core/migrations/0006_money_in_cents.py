@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:09
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Cast, Round
+
+# (model, field) pairs that move between Decimal dollars and integer cents
+MONEY_FIELDS = (('Account', 'balance'), ('Transaction', 'amount'))
+
+
+def dollars_to_cents(apps, schema_editor):
+    # SQLite keeps decimals as REAL, so 0.29 * 100 is 28.999999999999996;
+    # round before casting so the bigint column gets exact cents
+    for model_name, field in MONEY_FIELDS:
+        apps.get_model('core', model_name).objects.update(
+            **{field: Cast(Round(F(field) * 100), models.BigIntegerField())}
+        )
+
+
+def cents_to_dollars(apps, schema_editor):
+    # Multiply by 0.01 rather than divide by 100: SQLite casts a Decimal 100
+    # to INTEGER and would truncate with integer division
+    for model_name, field in MONEY_FIELDS:
+        apps.get_model('core', model_name).objects.update(
+            **{field: Round(
+                F(field) * Value(Decimal('0.01')),
+                2,
+                output_field=models.DecimalField(max_digits=12, decimal_places=2),
+            )}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_account_user'),
+    ]
+
+    operations = [
+        # Widen first: numeric(12,2) holds 10 integer digits, which balances
+        # of $100,000,000 or more overflow once multiplied by 100
+        migrations.AlterField(
+            model_name='account',
+            name='balance',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=14),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='amount',
+            field=models.DecimalField(decimal_places=2, max_digits=14),
+        ),
+        migrations.RunPython(dollars_to_cents, cents_to_dollars),
+        migrations.AlterField(
+            model_name='account',
+            name='balance',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='amount',
+            field=models.BigIntegerField(),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def clear_message_placeholders(apps, schema_editor):
+    # 0002 attached the auto-transfer fields to Message with throwaway defaults;
+    # no message ever carried real values in them
+    Message = apps.get_model('core', 'Message')
+    Message.objects.update(amount=None, frequency_days=None, from_account=None, to_account=None, next_run=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0006_money_in_cents'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='message',
+            name='amount',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='frequency_days',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='from_account',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='messages_from', to='core.account'),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='next_run',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='to_account',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='messages_to', to='core.account'),
+        ),
+        migrations.RunPython(clear_message_placeholders, migrations.RunPython.noop),
+        # The nested AutoTransfer only ever had a user column, so it is rebuilt
+        # with its real fields rather than back-filled
+        migrations.DeleteModel(
+            name='AutoTransfer',
+        ),
+        migrations.CreateModel(
+            name='AutoTransfer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.BigIntegerField()),
+                ('frequency_days', models.IntegerField()),
+                ('next_run', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('from_account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='from_auto', to='core.account')),
+                ('to_account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='to_auto', to='core.account')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
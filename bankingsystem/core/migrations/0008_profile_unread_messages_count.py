@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:12
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_unread_counts(apps, schema_editor):
+    Message = apps.get_model('core', 'Message')
+    Profile = apps.get_model('core', 'Profile')
+    unread = (
+        Message.objects.filter(is_read=False)
+        .order_by()
+        .values('receiver_id')
+        .annotate(n=Count('id'))
+    )
+    for row in unread:
+        Profile.objects.filter(user_id=row['receiver_id']).update(unread_messages_count=row['n'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_autotransfer_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='unread_messages_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_unread_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_profile_unread_messages_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['receiver', 'is_read', '-timestamp'], name='msg_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['receiver', 'is_read', '-timestamp'], name='notif_inbox_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:25
+
+from django.db import migrations
+
+SEARCH_COLUMNS = ('username', 'email', 'first_name', 'last_name')
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm GIN indexes make the customer search's icontains lookups
+    # index-backed; the expression matches the UPPER(col::text) LIKE that
+    # Django emits for icontains. Other backends keep plain LIKE scans.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS auth_user_{column}_trgm '
+            f'ON auth_user USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS auth_user_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0010_message_conversation_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:25
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_total_balances(apps, schema_editor):
+    Account = apps.get_model('core', 'Account')
+    Profile = apps.get_model('core', 'Profile')
+    totals = (
+        Account.objects.filter(owner=OuterRef('pk'))
+        .order_by()
+        .values('owner')
+        .annotate(total=Sum('balance'))
+        .values('total')
+    )
+    Profile.objects.update(total_balance_cached=Coalesce(Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_customer_search_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='total_balance_cached',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['-total_balance_cached'], name='profile_total_balance_idx'),
+        ),
+        migrations.RunPython(backfill_total_balances, migrations.RunPython.noop),
+    ]
@@ -1,21 +1,67 @@
+from decimal import Decimal
+
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 
+# Money is stored as integer cents; these convert at the form/display boundary
+def to_cents(amount):
+    return int((Decimal(amount) * 100).to_integral_value())
+
+
+def from_cents(cents):
+    return Decimal(cents or 0).scaleb(-2)
+
+
+class ProfileManager(models.Manager):
+    def get_queryset(self):
+        # __str__ and every listing show the username
+        return super().get_queryset().select_related('user')
+
+    def refresh_total_balances(self, *profile_ids):
+        """Recompute total_balance_cached for the given profiles from their accounts."""
+        totals = (
+            Account.objects.filter(owner=OuterRef('pk'))
+            .order_by()
+            .values('owner')
+            .annotate(total=Sum('balance'))
+            .values('total')
+        )
+        self.filter(pk__in=profile_ids).update(total_balance_cached=Coalesce(Subquery(totals), 0))
+
 
 class Profile(models.Model):
-    objects = None
     USER_ROLES = (
         ('customer', 'Customer'),
         ('staff', 'Staff'),
     )
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     role = models.CharField(max_length=10, choices=USER_ROLES)
+    # Maintained by the Message post_save signal and mark_messages_read(), so
+    # the unread badge needs no COUNT query
+    unread_messages_count = models.PositiveIntegerField(default=0)
+    # Sum of the profile's account balances in cents. Adjusted with F() next to
+    # every balance change and recomputed when an account is saved or deleted,
+    # so ranking customers by balance needs no GROUP BY
+    total_balance_cached = models.BigIntegerField(default=0)
+
+    objects = ProfileManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-total_balance_cached'], name='profile_total_balance_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} ({self.role})"
 
+    @property
+    def total_balance_display(self):
+        return from_cents(self.total_balance_cached)
+
 
 class Account(models.Model):
     ACCOUNT_TYPES = (
@@ -28,17 +74,36 @@ class Account(models.Model):
         ('rejected', 'Rejected'),
     )
     owner = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='accounts')
+    # Denormalized owner.user, kept in sync by a pre_save signal so account
+    # listings only need a single JOIN to show the username
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='owned_accounts',
+                             null=True, editable=False)
     account_type = models.CharField(max_length=10, choices=ACCOUNT_TYPES)
-    balance = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    balance = models.BigIntegerField(default=0)  # cents
     created_at = models.DateTimeField(auto_now_add=True)
-    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', db_index=True)
+
+    class Meta:
+        indexes = [
+            # Pending-accounts queue: filter by status, oldest first
+            models.Index(fields=['status', 'created_at'], name='account_status_created_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.owner.user.username} - {self.account_type} Account #{self.id}"
+        return f"{self.user.username} - {self.account_type} Account #{self.id}"
+
+    @property
+    def balance_display(self):
+        return from_cents(self.balance)
+
+
+class TransactionManager(models.Manager):
+    def get_queryset(self):
+        # Rows are nearly always rendered with their accounts' owners
+        return super().get_queryset().select_related('account__user', 'target_account__user')
 
 
 class Transaction(models.Model):
-    objects = None
     TRANSACTION_TYPES = (
         ('deposit', 'Deposit'),
         ('withdraw', 'Withdraw'),
@@ -46,16 +111,31 @@ class Transaction(models.Model):
     )
     transaction_type = models.CharField(max_length=10, choices=TRANSACTION_TYPES)
     account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='transactions')
-    amount = models.DecimalField(max_digits=12, decimal_places=2)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    amount = models.BigIntegerField()  # cents
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
     # For transfers, store the target account
     target_account = models.ForeignKey(Account, null=True, blank=True, on_delete=models.CASCADE,
                                        related_name='incoming_transfers')
 
+    objects = TransactionManager()
+
+    class Meta:
+        ordering = ['-timestamp']
+
     def __str__(self):
-        if self.transaction_type == 'transfer' and self.target_account:
-            return f"{self.transaction_type.title()} from Account #{self.account.id} to Account #{self.target_account.id} - ${self.amount}"
-        return f"{self.transaction_type.title()} on Account #{self.account.id} - ${self.amount}"
+        # Use the raw FK ids so rendering a row never loads the accounts
+        if self.transaction_type == 'transfer' and self.target_account_id:
+            return f"{self.transaction_type.title()} from Account #{self.account_id} to Account #{self.target_account_id} - ${self.amount_display}"
+        return f"{self.transaction_type.title()} on Account #{self.account_id} - ${self.amount_display}"
+
+    @property
+    def amount_display(self):
+        return from_cents(self.amount)
+
+    @property
+    def cumulative_balance_display(self):
+        # Only set when the queryset is annotated with cumulative_balance
+        return from_cents(self.cumulative_balance)
 
 
 class Notification(models.Model):
@@ -63,11 +143,15 @@ class Notification(models.Model):
     receiver = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications', null=True)
     message = models.TextField()
     action = models.CharField(max_length=255, default="Created")
-    timestamp = models.DateTimeField(auto_now_add=True)
-    is_read = models.BooleanField(default=False)
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    is_read = models.BooleanField(default=False, db_index=True)
 
-    def __str__(self):
-        return f"{self.receiver.username}: {self.message}"
+    class Meta:
+        ordering = ['-timestamp']
+        indexes = [
+            # Unread inbox: receiver + is_read, newest first
+            models.Index(fields=['receiver', 'is_read', '-timestamp'], name='notif_inbox_idx'),
+        ]
 
     def __str__(self):
         return self.message
@@ -75,33 +159,55 @@ class Notification(models.Model):
 class ActivityLog(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     action = models.CharField(max_length=255)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-timestamp']
 
     def __str__(self):
         return f"{self.user.username} - {self.action} at {self.timestamp}"
 
 
+class MessageManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().select_related('sender', 'receiver', 'from_account', 'to_account')
+
+
 class Message(models.Model):
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
     receiver = models.ForeignKey(User, on_delete=models.CASCADE, related_name='received_messages')
     content = models.TextField()
-    timestamp = models.DateTimeField(auto_now_add=True)
-    is_read = models.BooleanField(default=False)
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    is_read = models.BooleanField(default=False, db_index=True)
 
     # Optional fields for transfers / auto messages
-    amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    amount = models.BigIntegerField(null=True, blank=True)  # cents
     frequency_days = models.IntegerField(null=True, blank=True)
     from_account = models.ForeignKey('Account', on_delete=models.SET_NULL, null=True, blank=True, related_name='messages_from')
     to_account = models.ForeignKey('Account', on_delete=models.SET_NULL, null=True, blank=True, related_name='messages_to')
     next_run = models.DateField(null=True, blank=True)
 
+    objects = MessageManager()
+
+    class Meta:
+        ordering = ['-timestamp']
+        indexes = [
+            # Unread inbox: receiver + is_read, newest first
+            models.Index(fields=['receiver', 'is_read', '-timestamp'], name='msg_inbox_idx'),
+            # Conversation view: everything sent or received, newest first
+            models.Index(fields=['sender', '-timestamp'], name='msg_sent_idx'),
+            models.Index(fields=['receiver', '-timestamp'], name='msg_received_idx'),
+        ]
+
     def __str__(self):
         return f"From {self.sender.username} to {self.receiver.username} at {self.timestamp}"
-    
-    class AutoTransfer(models.Model):
-        user = models.ForeignKey(User, on_delete=models.CASCADE)
+
+
+class AutoTransfer(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
     from_account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='from_auto')
     to_account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='to_auto')
-    amount = models.FloatField()
+    amount = models.BigIntegerField()  # cents
     frequency_days = models.IntegerField()  # run every X days
-    next_run = models.DateTimeField(default=timezone.now)
\ No newline at end of file
+    # Indexed for the scheduler's "next_run <= now" sweep
+    next_run = models.DateTimeField(default=timezone.now, db_index=True)
@@ -1,7 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
 from django.contrib.auth.models import User
+from django.db.models import F, QuerySet
+from django.db.models.functions import Greatest
 from django.dispatch import receiver
-from .models import Profile
+from .caching import invalidate_admin_dashboard, invalidate_staff_profile_user_ids, invalidate_staff_user_ids
+from .models import Account, Message, Profile, Transaction
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -9,6 +12,94 @@ def create_user_profile(sender, instance, created, **kwargs):
         # Default role is 'customer'; admin users can be updated manually
         Profile.objects.create(user=instance, role='customer')
 
+@receiver(pre_save, sender=Account)
+def sync_account_user(sender, instance, **kwargs):
+    # Keep the denormalized Account.user in step with the owning profile
+    instance.user_id = instance.owner.user_id
+
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
\ No newline at end of file
+@receiver(post_delete, sender=User)
+def clear_staff_user_cache(sender, instance, **kwargs):
+    # Logins only touch last_login; don't drop the cache for those
+    update_fields = kwargs.get('update_fields')
+    if update_fields and 'is_staff' not in update_fields:
+        return
+    invalidate_staff_user_ids()
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def clear_staff_profile_cache(sender, instance, **kwargs):
+    # Counter updates and other partial saves can't change who is staff
+    update_fields = kwargs.get('update_fields')
+    if update_fields and 'role' not in update_fields:
+        return
+    invalidate_staff_profile_user_ids()
+
+def adjust_unread_count(user_id, delta):
+    Profile.objects.filter(user_id=user_id).update(
+        unread_messages_count=Greatest(F('unread_messages_count') + delta, 0)
+    )
+
+def unread_receiver_id(message):
+    # The user whose counter includes this row, or None when it's read
+    return None if message.is_read else message.receiver_id
+
+@receiver(post_init, sender=Message)
+def remember_unread_receiver(sender, instance, **kwargs):
+    # Rows loaded with is_read/receiver deferred can't change them on save
+    loaded = instance.__dict__
+    if 'is_read' in loaded and 'receiver_id' in loaded:
+        instance._counted_receiver_id = unread_receiver_id(instance)
+
+@receiver(post_save, sender=Message)
+def count_unread_message(sender, instance, created, **kwargs):
+    if created:
+        previous = None
+    elif hasattr(instance, '_counted_receiver_id'):
+        previous = instance._counted_receiver_id
+    else:
+        return
+    current = unread_receiver_id(instance)
+    if previous != current:
+        # e.g. is_read flipped from the admin
+        if previous is not None:
+            adjust_unread_count(previous, -1)
+        if current is not None:
+            adjust_unread_count(current, 1)
+    instance._counted_receiver_id = current
+
+def deleted_user_ids(origin):
+    """Ids of the users whose deletion triggered a cascade (origin of post_delete)."""
+    if isinstance(origin, User):
+        return {origin.pk}
+    if isinstance(origin, QuerySet) and origin.model is User:
+        # Messages are removed before their users, so the rows still exist;
+        # look them up once per delete rather than once per message
+        if not hasattr(origin, '_deleted_user_ids'):
+            origin._deleted_user_ids = set(origin.values_list('pk', flat=True))
+        return origin._deleted_user_ids
+    return set()
+
+@receiver(post_delete, sender=Message)
+def uncount_deleted_message(sender, instance, origin=None, **kwargs):
+    # Also runs for cascades, e.g. when the sender is deleted. Skip receivers
+    # deleted in the same cascade: their profile is going away anyway
+    receiver_id = unread_receiver_id(instance)
+    if receiver_id is not None and receiver_id not in deleted_user_ids(origin):
+        adjust_unread_count(receiver_id, -1)
+
+# No post_delete on Transaction: a receiver there would stop the ledger from
+# being cascade-deleted in bulk. Deleting an account or customer invalidates
+# once instead.
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def clear_admin_dashboard_cache(sender, instance, **kwargs):
+    # bulk_create() and update() send no signals; those callers invalidate directly
+    invalidate_admin_dashboard()
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def refresh_owner_total_balance(sender, instance, **kwargs):
+    # Form saves set the balance outright; recompute rather than adjust
+    Profile.objects.refresh_total_balances(instance.owner_id)
@@ -19,6 +19,7 @@ urlpatterns = [
     path('dashboard/', dashboard, name='dashboard'),
     path('dashboard/admin/', admin_dashboard, name='admin_dashboard'),
     path('dashboard/customer/', customer_dashboard, name='customer_dashboard'),
+    path('dashboard/chart/balances/', views.customer_balance_chart, name='balance_chart_json'),
 
     # Customers (ADMIN DASHBOARD)
     path('customers/', views.all_customers, name='all_customers'),
@@ -38,13 +39,17 @@ urlpatterns = [
     path('deposit/<int:account_id>/', deposit, name='deposit'),
     path('withdraw/<int:account_id>/', withdraw, name='withdraw'),
     path('transfer/<int:account_id>/', transfer, name='transfer'),
+    path('accounts/autocomplete/', views.account_autocomplete, name='account_autocomplete'),
+    path('customers/autocomplete/', views.customer_autocomplete, name='customer_autocomplete'),
 
     # Admin features
     path('dashboard/admin/notifications/', views.admin_notifications, name='admin_notifications'),
     path('dashboard/admin/pending-accounts/', views.pending_accounts, name='pending_accounts'),
     path('dashboard/admin/messages/', views.admin_messages, name='admin_messages'),
     path('dashboard/admin/transactions/', views.admin_transactions, name='admin_transactions'),
+    path('dashboard/admin/transactions/export/', views.admin_transactions_export, name='admin_transactions_export'),
     path('dashboard/admin/activity-logs/', views.admin_activity_logs, name='admin_activity_logs'),
+    path('dashboard/admin/activity-logs/export/', views.admin_activity_logs_export, name='admin_activity_logs_export'),
     path('customers/<int:user_id>/', views.view_customer, name='customer_detail'),
 
     # Customer features
@@ -1,20 +1,34 @@
+import csv
+import itertools
 import json
+from datetime import timedelta
 
 import pandas as pd
 import plotly.express as px
-import plotly.io as pio
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth.models import User
 from django.contrib.auth.views import LoginView
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.db import transaction as db_transaction
-from django.db.models import Count
+from django.db.models import Case, Count, Exists, F, Max, OuterRef, Prefetch, Value, When, Window
+from django.db.models.functions import Greatest, Left
 from django.db.models import Q
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
-from django.utils.safestring import mark_safe
 from django.views.decorators.csrf import csrf_protect
 
+from .caching import (
+    ADMIN_DASHBOARD_TTL,
+    BALANCE_CHART_TTL,
+    SPENDING_INSIGHTS_TTL,
+    admin_dashboard_key,
+    balance_chart_key,
+    get_staff_profile_user_ids,
+    invalidate_admin_dashboard,
+    spending_insights_key,
+)
 from .forms import AddCustomerForm
 from .forms import CustomerMessageForm
 from .forms import RegisterForm, AccountForm, DepositForm, WithdrawForm, TransferForm
@@ -25,10 +39,24 @@ from .models import (
     ActivityLog,  # Our Django model for ActivityLog
     Profile,
     Transaction,
+    from_cents,
 )
 from .models import Message
 
 
+LIST_PAGE_SIZE = 40
+PREVIEW_LENGTH = 80
+
+
+def paginate(request, queryset, per_page=LIST_PAGE_SIZE):
+    """Return the requested page of an ordered queryset, keeping other GET params for page links."""
+    page = Paginator(queryset, per_page).get_page(request.GET.get('page'))
+    params = request.GET.copy()
+    params.pop('page', None)
+    page.querystring = params.urlencode()
+    return page
+
+
 class CustomLoginView(LoginView):
     def get_success_url(self):
         user = self.request.user
@@ -72,6 +100,68 @@ def dashboard(request):
 
 from django.db.models import Sum
 
+# Transaction types broken down on the admin dashboard
+DASHBOARD_TRANSACTION_TYPES = ('deposit', 'withdraw', 'transfer_out', 'transfer_in')
+
+
+def admin_dashboard_stats():
+    """Figures shown on the admin dashboard that are the same for every staff user."""
+    # Total customers with at least one account (EXISTS semi-join, no DISTINCT)
+    total_customers = Profile.objects.filter(
+        Exists(Account.objects.filter(owner=OuterRef('pk'))), role='customer'
+    ).count()
+
+    # Total accounts and total balance
+    account_totals = Account.objects.aggregate(count=Count('id'), total=Sum('balance'))
+    total_accounts = account_totals['count']
+    total_balance = from_cents(account_totals['total'])
+
+    # Transactions today, with the per-type distribution, in one query
+    # Half-open [midnight, next midnight) range so the timestamp index is used;
+    # timestamp__date would wrap the column in DATE() and scan the table
+    today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    today_end = today_start + timedelta(days=1)
+    today_totals = Transaction.objects.filter(timestamp__gte=today_start, timestamp__lt=today_end).aggregate(
+        count=Count('id'),
+        total=Sum('amount'),
+        **{
+            tx_type: Sum('amount', filter=Q(transaction_type=tx_type))
+            for tx_type in DASHBOARD_TRANSACTION_TYPES
+        }
+    )
+    total_transactions_today = today_totals['count']
+    total_amount_today = from_cents(today_totals['total'])
+    transaction_type_summary_dict = {
+        tx_type: from_cents(today_totals[tx_type])
+        for tx_type in DASHBOARD_TRANSACTION_TYPES
+        if today_totals[tx_type] is not None
+    }
+
+    # Large transactions alert
+    large_transaction_threshold = 10000
+    large_transactions = Transaction.objects.filter(amount__gte=large_transaction_threshold * 100).order_by('-amount')[:10]
+
+    # Top 5 customers by total balance (only those with accounts), read off the
+    # indexed total_balance_cached column instead of summing every account
+    # (ProfileManager joins user, so listing names costs no extra queries)
+    top_customers = list(
+        Profile.objects.filter(Exists(Account.objects.filter(owner=OuterRef('pk'))), role='customer')
+        .order_by('-total_balance_cached')[:5]
+    )
+
+    return {
+        'total_customers': total_customers,
+        'total_accounts': total_accounts,
+        'total_balance': total_balance,
+        'total_transactions_today': total_transactions_today,
+        'total_amount_today': total_amount_today,
+        'transaction_type_summary': transaction_type_summary_dict,
+        'large_transaction_threshold': large_transaction_threshold,
+        'large_transactions': list(large_transactions),
+        'top_customers': top_customers,
+    }
+
+
 @login_required
 def admin_dashboard(request):
     profile = request.user.profile
@@ -82,55 +172,19 @@ def admin_dashboard(request):
             return redirect('customer_dashboard')
         return redirect('login')
 
-    # Total customers with at least one account
-    total_customers = Profile.objects.filter(role='customer', accounts__isnull=False).distinct().count()
-
-    # Total accounts and total balance
-    total_accounts = Account.objects.count()
-    total_balance = Account.objects.aggregate(total=Sum('balance'))['total'] or 0
-
-    # Transactions today
-    today = timezone.now().date()
-    transactions_today = Transaction.objects.filter(timestamp__date=today)
-    total_transactions_today = transactions_today.count()
-    total_amount_today = transactions_today.aggregate(total=Sum('amount'))['total'] or 0
-
-    # Transaction type distribution
-    transaction_type_summary = transactions_today.values('transaction_type').annotate(
-        total_amount=Sum('amount'),
-        count=Count('id')
-    )
-    transaction_type_summary_dict = {item['transaction_type']: item['total_amount'] for item in transaction_type_summary}
+    # Shared figures are cached briefly so repeated refreshes skip the aggregates
+    stats = cache.get_or_set(admin_dashboard_key(), admin_dashboard_stats, ADMIN_DASHBOARD_TTL)
 
     # Recent transactions
     recent_transactions = Transaction.objects.order_by('-timestamp')[:10]
 
     # Latest notifications for admin
-    notifications = Notification.objects.filter(receiver=request.user).order_by('-timestamp')[:10]
-
-    # Large transactions alert
-    large_transaction_threshold = 10000
-    large_transactions = Transaction.objects.filter(amount__gte=large_transaction_threshold).order_by('-amount')[:10]
-
-    # Top 5 customers by total balance (only those with accounts)
-    top_customers = (
-        Profile.objects.filter(role='customer', accounts__isnull=False)
-        .annotate(total_balance=Sum('accounts__balance'))
-        .order_by('-total_balance')[:5]
-    )
+    notifications = Notification.objects.filter(receiver=request.user).select_related('sender').order_by('-timestamp')[:10]
 
     context = {
-        'total_customers': total_customers,
-        'total_accounts': total_accounts,
-        'total_balance': total_balance,
-        'total_transactions_today': total_transactions_today,
-        'total_amount_today': total_amount_today,
-        'transaction_type_summary': transaction_type_summary_dict,
+        **stats,
         'transactions': recent_transactions,
         'notifications': notifications,
-        'large_transaction_threshold': large_transaction_threshold,
-        'large_transactions': large_transactions,
-        'top_customers': top_customers,
     }
 
     return render(request, 'admin/dashboard.html', context)
@@ -140,24 +194,17 @@ def customer_dashboard(request):
     if profile.role != 'customer':
         return redirect('dashboard')
 
-    accounts = profile.accounts.all()
-    account_transactions = {
-        acc.id: acc.transactions.all().order_by('-timestamp')
-        for acc in accounts
-    }
+    # Each account's 20 most recent transactions, fetched in one extra query
+    recent_transactions = Transaction.objects.select_related(None).only(
+        'id', 'amount', 'transaction_type', 'timestamp', 'account'
+    ).order_by('-timestamp')[:20]
+    accounts = profile.accounts.prefetch_related(
+        Prefetch('transactions', queryset=recent_transactions, to_attr='recent_txns')
+    )
 
     # Fetch notifications for the logged-in customer (most recent first)
     notifications = Notification.objects.filter(receiver=request.user).order_by('-timestamp')[:10]
 
-    balance_chart = None
-    if accounts.exists():
-        df_bal = pd.DataFrame([
-            {'Account': acc.id, 'Balance': float(acc.balance)}
-            for acc in accounts
-        ])
-        fig = px.bar(df_bal, x='Account', y='Balance', title='Your Account Balances')
-        balance_chart = mark_safe(pio.to_html(fig, full_html=False))
-
     # Placeholder for transaction type chart (for future use)
     transaction_type_chart = None
     # In the future, you might aggregate transaction types here and create a chart
@@ -165,13 +212,32 @@ def customer_dashboard(request):
     return render(request, 'customer/dashboard.html', {
         'role': 'customer',
         'accounts': accounts,
-        'account_transactions': account_transactions,
-        'balance_chart': balance_chart,
         'notifications': notifications,
         'transaction_type_chart': transaction_type_chart,
     })
 
 
+@login_required
+def customer_balance_chart(request):
+    """Plotly figure JSON for the dashboard balance chart, fetched after page load."""
+    profile = request.user.profile
+    if profile.role != 'customer':
+        return JsonResponse({'data': [], 'layout': {}}, status=403)
+
+    # Plain (id, cents) tuples straight into the DataFrame, no model instances
+    balance_rows = list(profile.accounts.order_by('id').values_list('id', 'balance'))
+    # Serialized figure is reused until one of the balances changes
+    chart_key = balance_chart_key(profile.id, balance_rows)
+    chart_json = cache.get(chart_key)
+    if chart_json is None:
+        df_bal = pd.DataFrame.from_records(balance_rows, columns=['Account', 'Balance'])
+        df_bal['Balance'] = df_bal['Balance'].astype('float64') / 100
+        fig = px.bar(df_bal, x='Account', y='Balance', title='Your Account Balances')
+        chart_json = fig.to_json()
+        cache.set(chart_key, chart_json, BALANCE_CHART_TTL)
+    return HttpResponse(chart_json, content_type='application/json')
+
+
 @login_required
 def account_detail(request, account_id):
     account = get_object_or_404(Account, id=account_id)
@@ -180,23 +246,20 @@ def account_detail(request, account_id):
     if profile.role == 'customer' and account.owner != profile:
         return redirect('dashboard')
 
-    transactions = account.transactions.all().order_by('timestamp')
-
-    # Calculate balance over time for chart
-    balance = 0
-    txn_data = []
-    for txn in transactions:
-        if txn.transaction_type in ['deposit', 'transfer_in']:
-            balance += txn.amount
-        elif txn.transaction_type in ['withdraw', 'transfer_out']:
-            balance -= txn.amount
-        # Add a temporary attribute to hold cumulative balance
-        txn.cumulative_balance = balance
-        txn_data.append(txn)
+    # Running balance computed by the database: each row's signed amount
+    # summed over every earlier row
+    signed_amount = Case(
+        When(transaction_type__in=['deposit', 'transfer_in'], then=F('amount')),
+        When(transaction_type__in=['withdraw', 'transfer_out'], then=-F('amount')),
+        default=Value(0),
+    )
+    transactions = account.transactions.select_related(None).annotate(
+        cumulative_balance=Window(Sum(signed_amount), order_by=[F('timestamp').asc(), F('id').asc()])
+    ).order_by('timestamp', 'id')
 
     return render(request, 'customer/account_detail.html', {
         'account': account,
-        'transactions': txn_data,  # use txn_data so template can read cumulative_balance
+        'transactions': transactions,
         'role': profile.role
     })
 
@@ -219,8 +282,10 @@ def deposit(request, account_id):
     if request.method == 'POST' and form.is_valid():
         amount = form.cleaned_data['amount']
         with db_transaction.atomic():
-            account.balance += amount
-            account.save()
+            Account.objects.filter(pk=account.pk).update(balance=F('balance') + amount)
+            Profile.objects.filter(pk=account.owner_id).update(
+                total_balance_cached=F('total_balance_cached') + amount
+            )
             Transaction.objects.create(
                 account=account,
                 transaction_type='deposit',
@@ -250,17 +315,23 @@ def withdraw(request, account_id):
         form = WithdrawForm(request.POST, account=account)
         if form.is_valid():
             amount = form.cleaned_data['amount']
-            if amount > account.balance:
-                messages.error(request, 'Insufficient balance')
-            else:
-                with db_transaction.atomic():
-                    account.balance -= amount
-                    account.save()
+            with db_transaction.atomic():
+                # Debit only if the balance still covers it at write time
+                updated = Account.objects.filter(pk=account.pk, balance__gte=amount).update(
+                    balance=F('balance') - amount
+                )
+                if updated:
+                    Profile.objects.filter(pk=account.owner_id).update(
+                        total_balance_cached=F('total_balance_cached') - amount
+                    )
                     Transaction.objects.create(
                         account=account,
                         transaction_type='withdraw',
                         amount=amount
                     )
+            if not updated:
+                messages.error(request, 'Insufficient balance')
+            else:
                 messages.success(request, 'Withdrawal successful')
                 return redirect('account_detail', account_id=account.id)
     else:
@@ -286,55 +357,100 @@ def transfer(request, account_id):
 
             if target == account:
                 messages.error(request, 'Cannot transfer to same account')
-            elif amount > account.balance:
-                messages.error(request, 'Insufficient balance')
             else:
                 with db_transaction.atomic():
-                    # 1️⃣ Update balances
-                    account.balance -= amount
-                    target.balance += amount
-                    account.save()
-                    target.save()
-
-                    # 2️⃣ Create transaction records
-                    txn_out = Transaction.objects.create(
-                        account=account,
-                        transaction_type='transfer_out',
-                        amount=amount
+                    # 1️⃣ Update balances; the debit only applies if the
+                    # balance still covers it at write time
+                    updated = Account.objects.filter(pk=account.pk, balance__gte=amount).update(
+                        balance=F('balance') - amount
                     )
-                    txn_in = Transaction.objects.create(
-                        account=target,
-                        transaction_type='transfer_in',
-                        amount=amount
-                    )
-
-                    # 3️⃣ Create notifications
-                    Notification.objects.create(
-                        sender=account.owner.user,
-                        receiver=target.owner.user,
-                        message=f"You received ${amount} from {account.owner.user.username}"
-                    )
-                    Notification.objects.create(
-                        sender=account.owner.user,
-                        receiver=account.owner.user,
-                        message=f"You sent ${amount} to {target.owner.user.username}"
-                    )
-
-                    # 4️⃣ Optional: notify all admins
-                    admin_profiles = Profile.objects.filter(role='staff')
-                    for admin in admin_profiles:
-                        Notification.objects.create(
-                            sender=account.owner.user,
-                            receiver=admin.user,
-                            message=f"{account.owner.user.username} transferred ${amount} to {target.owner.user.username}"
-                        )
-
-                messages.success(request, 'Transfer successful')
-                return redirect('account_detail', account_id=account.id)
+                    if updated:
+                        Account.objects.filter(pk=target.pk).update(balance=F('balance') + amount)
+                        if account.owner_id != target.owner_id:
+                            Profile.objects.filter(pk=account.owner_id).update(
+                                total_balance_cached=F('total_balance_cached') - amount
+                            )
+                            Profile.objects.filter(pk=target.owner_id).update(
+                                total_balance_cached=F('total_balance_cached') + amount
+                            )
+
+                        # 2️⃣ Create both transaction records in one INSERT
+                        Transaction.objects.bulk_create([
+                            Transaction(account=account, transaction_type='transfer_out', amount=amount),
+                            Transaction(account=target, transaction_type='transfer_in', amount=amount),
+                        ])
+
+                        # 3️⃣ Create notifications for both parties and every admin
+                        # (staff ids come from the cache) in a single INSERT
+                        admin_message = f"{account.user.username} transferred ${from_cents(amount)} to {target.user.username}"
+                        Notification.objects.bulk_create([
+                            Notification(
+                                sender=account.user,
+                                receiver=target.user,
+                                message=f"You received ${from_cents(amount)} from {account.user.username}"
+                            ),
+                            Notification(
+                                sender=account.user,
+                                receiver=account.user,
+                                message=f"You sent ${from_cents(amount)} to {target.user.username}"
+                            ),
+                            *(
+                                Notification(sender=account.user, receiver_id=admin_user_id, message=admin_message)
+                                for admin_user_id in get_staff_profile_user_ids()
+                            ),
+                        ], batch_size=500)
+                        # bulk_create sends no post_save, so drop the cached figures here
+                        invalidate_admin_dashboard()
+
+                if not updated:
+                    messages.error(request, 'Insufficient balance')
+                else:
+                    messages.success(request, 'Transfer successful')
+                    return redirect('account_detail', account_id=account.id)
     else:
         form = TransferForm(account=account)
 
     return render(request, 'customer/transfer.html', {'form': form, 'role': profile.role})
+
+
+AUTOCOMPLETE_LIMIT = 20
+
+
+@login_required
+def account_autocomplete(request):
+    """Return approved accounts matching the typed owner name or account number."""
+    query = request.GET.get('q', '').strip()
+    accounts = Account.objects.filter(status='approved').select_related('user')
+
+    exclude_id = request.GET.get('exclude')
+    if exclude_id and exclude_id.isdigit():
+        accounts = accounts.exclude(id=exclude_id)
+    if query.isdigit():
+        accounts = accounts.filter(id=query)
+    elif query:
+        accounts = accounts.filter(user__username__istartswith=query)
+
+    accounts = accounts.only('id', 'account_type', 'user__username').order_by('id')[:AUTOCOMPLETE_LIMIT]
+    return JsonResponse({
+        'results': [{'id': acc.id, 'text': str(acc)} for acc in accounts]
+    })
+
+
+@login_required
+def customer_autocomplete(request):
+    """Return customer profiles whose username starts with the typed text."""
+    if request.user.profile.role != 'staff':
+        return JsonResponse({'results': []}, status=403)
+
+    query = request.GET.get('q', '').strip()
+    customers = Profile.objects.filter(role='customer')
+    if query:
+        customers = customers.filter(user__username__istartswith=query)
+
+    customers = customers.only('id', 'role', 'user__username').order_by('user__username')[:AUTOCOMPLETE_LIMIT]
+    return JsonResponse({
+        'results': [{'id': p.id, 'text': str(p)} for p in customers]
+    })
 @login_required
 @csrf_protect
 def create_account(request):
@@ -366,17 +482,11 @@ def admin_customers(request):
 
 @login_required
 def all_accounts(request):
-    accounts = Account.objects.all()
+    accounts = Account.objects.select_related('user').only(
+        'id', 'account_type', 'balance', 'user__username'
+    ).order_by('id')
     return render(request, 'admin/all_accounts.html', {
-        'accounts': accounts
-    })
-
-
-@login_required
-def all_customers(request):
-    customers = Profile.objects.filter(role='customer')
-    return render(request, 'admin/all_customers.html', {
-        'customers': customers
+        'accounts': paginate(request, accounts)
     })
 
 
@@ -443,6 +553,7 @@ def delete_customer(request, user_id):
     user = profile.user
     if request.method == "POST":
         user.delete()
+        invalidate_admin_dashboard()
         messages.success(request, "Customer deleted successfully.")
         return redirect('all_customers')
 
@@ -456,9 +567,13 @@ def edit_account(request, account_id):
         return redirect('dashboard')
 
     if request.method == "POST":
+        previous_owner_id = account.owner_id
         form = AccountForm(request.POST, instance=account)
         if form.is_valid():
             form.save()
+            # The post_save signal refreshes the new owner's total only
+            if account.owner_id != previous_owner_id:
+                Profile.objects.refresh_total_balances(previous_owner_id)
             messages.success(request, "Account updated successfully.")
             return redirect('all_accounts')
         else:
@@ -478,6 +593,7 @@ def delete_account(request, account_id):
 
     if request.method == "POST":
         account.delete()
+        invalidate_admin_dashboard()
         messages.success(request, "Account deleted successfully.")
         return redirect('all_accounts')
 
@@ -492,16 +608,21 @@ def admin_notifications(request):
         return redirect('dashboard')
 
     # Fetch all notifications ordered by latest first
-    notifications = Notification.objects.all().order_by('-timestamp')
+    # Ship only a preview of the message body; the list truncates it anyway
+    notifications = Notification.objects.only('id', 'timestamp', 'is_read').annotate(
+        preview=Left('message', PREVIEW_LENGTH + 1)
+    ).order_by('-timestamp')
 
     context = {
-        'notifications': notifications
+        'notifications': paginate(request, notifications)
     }
     return render(request, 'admin/notifications.html', context)
 
 @login_required
 def pending_accounts(request):
-    accounts = Account.objects.filter(status='pending')
+    accounts = Account.objects.filter(status='pending').select_related('user').only(
+        'id', 'account_type', 'balance', 'user__username'
+    )
 
     if request.method == 'POST':
         action = request.POST.get('action')
@@ -517,6 +638,16 @@ def pending_accounts(request):
 
     return render(request, 'admin/pending_accounts.html', {'accounts': accounts})
 
+def mark_messages_read(user):
+    """Mark the user's unread messages as read and take them off their unread counter."""
+    marked = Message.objects.filter(receiver=user, is_read=False).update(is_read=True)
+    if marked:
+        Profile.objects.filter(user=user).update(
+            unread_messages_count=Greatest(F('unread_messages_count') - marked, 0)
+        )
+        user.profile.refresh_from_db(fields=['unread_messages_count'])
+
+
 @login_required
 def admin_messages(request):
     profile = request.user.profile
@@ -524,9 +655,13 @@ def admin_messages(request):
         return redirect('dashboard')
 
     # Fetch messages using the Django Message model
-    messages_list = Message.objects.order_by('-timestamp')
+    # Ship only a preview of the message body; the list truncates it anyway
+    messages_list = Message.objects.select_related(None).select_related('sender', 'receiver').only(
+        'id', 'timestamp', 'is_read', 'sender__username', 'receiver__username'
+    ).annotate(preview=Left('content', PREVIEW_LENGTH + 1)).order_by('-timestamp')
+    mark_messages_read(request.user)
     context = {
-        'messages': messages_list
+        'messages': paginate(request, messages_list)
     }
     return render(request, 'admin/messages.html', context)
 
@@ -538,9 +673,20 @@ def admin_transactions(request):
     if profile.role != 'staff':
         return redirect('dashboard')
 
-    transactions = Transaction.objects.all().order_by('-timestamp')
+    # Only the columns the table shows; pagination bounds each page to LIST_PAGE_SIZE rows
+    transactions = Transaction.objects.select_related(None).select_related('account__user').only(
+        'id', 'timestamp', 'amount', 'transaction_type', 'account__id', 'account__user__username'
+    ).order_by('-timestamp')
+    transactions = filter_transactions(request, transactions)
+
+    context = {
+        'transactions': paginate(request, transactions)
+    }
+    return render(request, 'admin/transactions.html', context)
+
 
-    # Filters
+def filter_transactions(request, transactions):
+    """Apply the admin transaction filters from the query string."""
     account_id = request.GET.get('account_id')
     customer_username = request.GET.get('customer')
     tx_type = request.GET.get('type')
@@ -551,34 +697,90 @@ def admin_transactions(request):
         transactions = transactions.filter(account__user__username__icontains=customer_username)
     if tx_type:
         transactions = transactions.filter(transaction_type=tx_type)
+    return transactions
 
-    context = {
-        'transactions': transactions
-    }
-    return render(request, 'admin/transactions.html', context)
+
+EXPORT_CHUNK_SIZE = 2000
 
 
+class Echo:
+    """Pseudo-buffer for csv.writer: hands each formatted line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(filename, header, rows):
+    """Stream rows as a CSV download without holding the result set in memory."""
+    writer = csv.writer(Echo())
+    lines = (writer.writerow(row) for row in itertools.chain([header], rows))
+    response = StreamingHttpResponse(lines, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@login_required
+def admin_transactions_export(request):
+    if request.user.profile.role != 'staff':
+        return redirect('dashboard')
+
+    transactions = filter_transactions(request, Transaction.objects.order_by('-timestamp'))
+    # values_list + iterator: plain tuples fetched in chunks, no model instances
+    rows = (
+        (tx_id, account_id, username, tx_type, from_cents(amount), timestamp.isoformat())
+        for tx_id, account_id, username, tx_type, amount, timestamp in transactions.values_list(
+            'id', 'account_id', 'account__user__username', 'transaction_type', 'amount', 'timestamp'
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    return stream_csv(
+        'transactions.csv',
+        ['ID', 'Account ID', 'Customer', 'Type', 'Amount', 'Timestamp'],
+        rows,
+    )
+
 
 @login_required
 def admin_activity_logs(request):
-    logs = ActivityLog.objects.select_related('user').order_by('-timestamp')
+    logs = ActivityLog.objects.select_related('user').only(
+        'id', 'timestamp', 'action', 'user__username'
+    ).order_by('-timestamp')
     return render(request, 'admin/activity_logs.html', {
-        'logs': logs
+        'logs': paginate(request, logs)
     })
 
+
+@login_required
+def admin_activity_logs_export(request):
+    if request.user.profile.role != 'staff':
+        return redirect('dashboard')
+
+    logs = ActivityLog.objects.order_by('-timestamp').values_list(
+        'user__username', 'action', 'timestamp'
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    rows = ((username, action, timestamp.isoformat()) for username, action, timestamp in logs)
+    return stream_csv('activity_logs.csv', ['User', 'Action', 'Timestamp'], rows)
+
 @login_required
 @csrf_protect
 def spending_insights(request):
     user = request.user
-    accounts = Account.objects.filter(owner__user=user)
-    transactions = Transaction.objects.filter(account__in=accounts, transaction_type='withdrawal')
-    # Aggregate by category (assuming tx.category exists)
-    data = transactions.values('category').annotate(total=Sum('amount'))
-    chart_data = {
-        'labels': [item['category'] for item in data],
-        'amounts': [float(item['total']) for item in data]
-    }
-    return render(request, 'customer/spending_insights.html', {'chart_data': json.dumps(chart_data)})
+    transactions = Transaction.objects.filter(
+        account__user=user, transaction_type__in=['withdraw', 'transfer_out']
+    )
+    # The serialized payload is reused until an outgoing transaction is added
+    # or removed; checking that costs one aggregate on indexed columns
+    latest = transactions.aggregate(latest=Max('timestamp'), count=Count('id'))
+    cache_key = spending_insights_key(user.id, latest['latest'], latest['count'])
+    chart_data = cache.get(cache_key)
+    if chart_data is None:
+        # Outgoing totals per transaction type, grouped in the database
+        data = transactions.values('transaction_type').annotate(total=Sum('amount')).order_by('transaction_type')
+        chart_data = json.dumps({
+            'labels': [item['transaction_type'] for item in data],
+            'amounts': [item['total'] / 100 for item in data]
+        })
+        cache.set(cache_key, chart_data, SPENDING_INSIGHTS_TTL)
+    return render(request, 'customer/spending_insights.html', {'chart_data': chart_data})
 
 @login_required
 def profile_update(request):
@@ -591,29 +793,6 @@ def profile_update(request):
         return redirect('customer_dashboard')
     return render(request, 'customer/profile.html', {'user': user})
 
-@login_required
-def customer_messages(request):
-    user = request.user
-
-    # Get messages involving this customer
-    messages_list = Message.objects.filter(
-        receiver=user
-    ).order_by('-timestamp')
-
-    if request.method == "POST":
-        content = request.POST.get('content')
-        # Send message to admin(s)
-        admin_users = User.objects.filter(profile__role='staff')
-        for admin in admin_users:
-            Message.objects.create(sender=user, receiver=admin, content=content)
-        return redirect('customer_messages')
-
-    context = {
-        'messages': messages_list
-    }
-    return render(request, 'customer/messages.html', context)
-
-
 @login_required
 def customer_profile(request):
     profile = request.user.profile
@@ -625,7 +804,9 @@ def customer_profile(request):
         request.user.email = request.POST.get('email')
         request.user.save()
         profile.role = request.POST.get('role')  # optional, if you want them to see role
-        profile.save()
+        # Only role changes here; a full save would write back the counters
+        # read at the start of the request over concurrent F() updates
+        profile.save(update_fields=['role'])
         return redirect('customer_profile')
 
     context = {
@@ -650,15 +831,17 @@ def customer_messages(request):
             return redirect('customer_messages')
     else:
         form = CustomerMessageForm(user=user)
+        mark_messages_read(user)
 
-    # Show messages sent or received
-    messages_list = Message.objects.filter(sender=user).union(
-        Message.objects.filter(receiver=user)
+    # Show messages sent or received: one OR query, each side served by its
+    # (sender|receiver, -timestamp) index
+    messages_list = Message.objects.select_related(None).select_related('sender', 'receiver').filter(
+        Q(sender=user) | Q(receiver=user)
     ).order_by('-timestamp')
 
     return render(request, 'customer/messages.html', {
         'form': form,
-        'messages': messages_list
+        'messages': paginate(request, messages_list)
     })
 
 @login_required
@@ -668,17 +851,21 @@ def all_customers(request):
 
     query = request.GET.get('q', '')
 
-    customers = Profile.objects.filter(
-        role='customer'
-    ).filter(
-        Q(user__username__icontains=query) |
-        Q(user__email__icontains=query) |
-        Q(user__first_name__icontains=query) |
-        Q(user__last_name__icontains=query)
-    )
+    customers = Profile.objects.filter(role='customer')
+    # An empty search matches everyone; skip the four match-anything LIKE scans
+    if query:
+        customers = customers.filter(
+            Q(user__username__icontains=query) |
+            Q(user__email__icontains=query) |
+            Q(user__first_name__icontains=query) |
+            Q(user__last_name__icontains=query)
+        )
+    customers = customers.only(
+        'id', 'user__id', 'user__username', 'user__email', 'user__first_name', 'user__last_name'
+    ).order_by('user__username')
 
     context = {
-        'customers': customers,
+        'customers': paginate(request, customers),
         'query': query,
     }
 